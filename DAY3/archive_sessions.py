@@ -0,0 +1,58 @@
+# Moves old session databases out of the working folder into archive/
+# Archived sessions can still be searched (search_all_sessions(..., include_archive=True))
+#
+#   python archive_sessions.py --list
+#   python archive_sessions.py --keep 2       (keep the 2 newest sessions, archive the rest)
+import argparse
+import os
+import sqlite3
+from school_system import ARCHIVE_DIR, current_session, default_session, list_sessions
+
+def archive_session(session, path, archive_dir=ARCHIVE_DIR):
+    if not os.path.exists(archive_dir):
+        os.makedirs(archive_dir)
+    target = os.path.join(archive_dir, os.path.basename(path))
+    if os.path.exists(target):
+        raise FileExistsError(f"{target} already exists")
+
+    # VACUUM INTO writes a compact, consistent copy (including any WAL content)
+    conn = sqlite3.connect(path)
+    conn.execute("VACUUM INTO ?", (target,))
+    conn.close()
+
+    check = sqlite3.connect(target)
+    ok = check.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    check.close()
+    if not ok:
+        os.remove(target)
+        raise sqlite3.DatabaseError(f"Archived copy of session {session} failed the integrity check")
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return target
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old session databases")
+    parser.add_argument("--keep", type=int, default=2, help="Number of newest sessions to keep in place")
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR)
+    parser.add_argument("--list", action="store_true", help="Only list sessions and their sizes")
+    args = parser.parse_args()
+
+    shards = list_sessions()
+    if args.list:
+        for session, path in shards:
+            print(f"{session:<12}{os.path.getsize(path) / 1024:>10.1f} KB  {path}")
+        for session, path in list_sessions(args.archive_dir):
+            print(f"{session:<12}{os.path.getsize(path) / 1024:>10.1f} KB  {path} (archived)")
+        return
+
+    old = shards[:-args.keep] if args.keep > 0 else shards
+    in_use = {current_session(), default_session()}
+    for session, path in old:
+        if session in in_use:
+            continue
+        print(f"Archived {session} -> {archive_session(session, path, args.archive_dir)}")
+
+if __name__ == "__main__":
+    main()
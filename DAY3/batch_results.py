@@ -0,0 +1,172 @@
+# Headless batch runner: every card plus the class summary for one workbook
+#
+#   python batch_results.py students.xlsx
+#   python batch_results.py students.xlsx --scheme grading_scheme_example.json
+#   python batch_results.py students.xlsx --watch     (re-render changed rows on save)
+#   python batch_results.py students.xlsx --cache //server/share/card_cache
+import argparse
+import os
+import time
+import pandas as pd
+from class_report import write_class_report
+from file_version import file_version
+from grading_scheme import load_scheme
+from render_cache import DEFAULT_CACHE_DIR, RenderCache
+from result_card import detect_subjects, render_card
+
+OUTPUT_DIR = "Generated_Results"
+SAVE_GRACE = 5.0   # seconds a changed workbook may fail to load while Excel is still saving
+
+class ResultBatch:
+    # One loaded workbook: rows, subjects, grading scheme and scores
+    def __init__(self, path, scheme_path=""):
+        self.df = pd.read_excel(path)
+        self.df.columns = self.df.columns.str.strip()
+        self.subjects = detect_subjects(self.df)
+        self.scheme = load_scheme(scheme_path, path, self.subjects)
+        self.results = self.scheme.score(self.df, self.subjects)
+
+    def rows(self):
+        # {(roll_no, name): (index, row)} - one entry per card file, since
+        # the card file name is built from both
+        return {card_key(row): (i, row) for i, row in self.df.iterrows()}
+
+    def duplicates(self):
+        # Students sharing both Roll_No and Name would write the same card file
+        keys = [card_key(row) for _, row in self.df.iterrows()]
+        return sorted({key for key in keys if keys.count(key) > 1})
+
+    def snapshot(self):
+        # What a card depends on, per card. Values are compared as printed
+        # text (as in card_fingerprint), so a blank cell (NaN != NaN) is not
+        # seen as a change on every save
+        return {key: tuple(str(row[c]) for c in self.subjects) for key, (_, row) in self.rows().items()}
+
+def card_key(row):
+    return (str(row['Roll_No']), str(row['Name']))
+
+def card_label(key):
+    return f"{key[0]} ({key[1]})"
+
+def card_path(output_dir, row):
+    return f"{output_dir}/{row['Roll_No']}_{row['Name']}.pdf"
+
+def render_rows(batch, output_dir, keys=None, cache=None):
+    # Write the cards for keys (all students when None) and the class summary.
+    # With a RenderCache, cards rendered before are linked/copied from it.
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    for i, row in batch.df.iterrows():
+        if keys is not None and card_key(row) not in keys:
+            continue
+        target = card_path(output_dir, row)
+        if cache is not None:
+            cache.render_to(row, batch.subjects, batch.results.loc[i], batch.scheme, target, render_card)
+            continue
+        # The old file may be a hardlink into a cache; never write through it
+        if os.path.exists(target):
+            os.remove(target)
+        render_card(row, batch.subjects, batch.results.loc[i], batch.scheme).output(target)
+    write_class_report(batch.df, batch.subjects, batch.results, batch.scheme, output_dir)
+
+def generate_results(path, scheme_path="", output_dir=OUTPUT_DIR, cache=None):
+    batch = ResultBatch(path, scheme_path)
+    render_rows(batch, output_dir, cache=cache)
+    return batch
+
+class WorkbookWatcher:
+    # Call check() every so often; it re-renders only the students whose
+    # row changed since the last save of the workbook (or scheme file)
+    def __init__(self, path, scheme_path="", output_dir=OUTPUT_DIR, batch=None, cache=None):
+        self.path = path
+        self.scheme_path = scheme_path
+        self.output_dir = output_dir
+        self.cache = cache
+        self.version = self.file_version()
+        self.failing = None   # (version, time of first failed load) while a save is unreadable
+        self.batch = batch or ResultBatch(path, scheme_path)
+        self.rows_seen = self.batch.snapshot()
+
+    def file_version(self):
+        if self.scheme_path:
+            return file_version(self.path, self.scheme_path)
+        return file_version(self.path)
+
+    def check(self):
+        # Labels of the cards that were re-rendered or removed, or None if nothing was saved.
+        # Raises the load error once a save has stayed unreadable for SAVE_GRACE seconds;
+        # that save is then not retried until the file changes again.
+        version = self.file_version()
+        if version == self.version:
+            return None
+        try:
+            batch = ResultBatch(self.path, self.scheme_path)
+        except Exception:
+            now = time.monotonic()
+            if self.failing is None or self.failing[0] != version:
+                self.failing = (version, now)
+            if now - self.failing[1] < SAVE_GRACE:
+                return None   # Excel may still be writing the file
+            self.version = version
+            self.failing = None
+            raise
+        self.version = version
+        self.failing = None
+
+        new_rows = batch.snapshot()
+        if batch.subjects != self.batch.subjects or batch.scheme.to_dict() != self.batch.scheme.to_dict():
+            changed = set(new_rows)
+        else:
+            changed = {key for key, values in new_rows.items() if self.rows_seen.get(key) != values}
+
+        # Remove the cards of students that were deleted or renamed
+        old_rows = self.batch.rows()
+        gone = {key for key in self.rows_seen if key not in new_rows}
+        for key in gone:
+            old_file = card_path(self.output_dir, old_rows[key][1])
+            if os.path.exists(old_file):
+                os.remove(old_file)
+
+        if changed or gone:
+            render_rows(batch, self.output_dir, changed, self.cache)
+        self.batch = batch
+        self.rows_seen = new_rows
+        return [card_label(key) for key in sorted(changed | gone)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate result cards for a workbook")
+    parser.add_argument("sheet", help="Excel file with Name, Roll_No and subject columns")
+    parser.add_argument("--scheme", default="", help="Grading scheme JSON file")
+    parser.add_argument("--output", default=OUTPUT_DIR)
+    parser.add_argument("--cache", default=DEFAULT_CACHE_DIR, help="Shared folder of rendered cards")
+    parser.add_argument("--cache-mb", type=int, default=256, help="Size cap of the card cache")
+    parser.add_argument("--no-cache", action="store_true", help="Always render every card")
+    parser.add_argument("--watch", action="store_true", help="Keep running and re-render changed rows on save")
+    parser.add_argument("--interval", type=float, default=0.5, help="Seconds between checks in watch mode")
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else RenderCache(args.cache, args.cache_mb * 1024 * 1024)
+    batch = generate_results(args.sheet, args.scheme, args.output, cache)
+    print(f"Generated {len(batch.df)} cards in '{args.output}'")
+    for key in batch.duplicates():
+        print(f"Warning: {card_label(key)} appears more than once; only one card was kept")
+    if not args.watch:
+        return
+
+    watcher = WorkbookWatcher(args.sheet, args.scheme, args.output, batch, cache)
+    print(f"Watching {args.sheet} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(args.interval)
+            try:
+                updated = watcher.check()
+            except Exception as e:
+                print(f"Could not reload {args.sheet}: {e}")
+                continue
+            if updated:
+                print(f"Updated cards: {', '.join(updated)}")
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# Headless database benchmark for school_system (no Tk display needed)
+#
+# Fills a temporary database with synthetic students, then replays a mixed
+# read/write workload from several threads and reports latency percentiles
+# and throughput per operation.
+#
+#   python bench_school_db.py
+#   python bench_school_db.py --students 10000,100000,1000000 --threads 8
+#   python bench_school_db.py --mix add_student=50,delete_student=50 --ops 2000
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+import school_system
+
+NAMES = ["Ahmed", "Sara", "John", "Maria", "Ali", "Fatima", "Usman", "Ayesha", "Bilal", "Zainab"]
+GRADES = [str(g) for g in range(1, 11)]
+GENDERS = ["Male", "Female", "Other"]
+
+DEFAULT_MIX = "add_student=30,delete_student=10,fetch_totals=40,fetch_data=10,display_all=10"
+
+class NullWidget:
+    # Stands in for the Treeview / Label so display_all runs without a display
+    def get_children(self):
+        return ()
+
+    def delete(self, *items):
+        pass
+
+    def insert(self, *args, **kwargs):
+        pass
+
+    def config(self, **kwargs):
+        pass
+
+class HeadlessView:
+    # Runs SchoolManagement's own display code against NullWidgets
+    display_all = school_system.SchoolManagement.display_all
+    show_totals = school_system.SchoolManagement.show_totals
+
+    def __init__(self):
+        self.student_table = NullWidget()
+        self.totals_label = NullWidget()
+
+def random_student(rng):
+    return (f"{rng.choice(NAMES)} {rng.randint(1, 99999)}", rng.randint(5, 18),
+            rng.choice(GRADES), rng.choice(GENDERS))
+
+def populate(db_path, count, seed=0):
+    school_system.initialize_db(db_path)
+    rng = random.Random(seed)
+    conn = school_system.connect(db_path)
+    conn.executemany("INSERT INTO students (name, age, grade, gender) VALUES (?, ?, ?, ?)",
+                     (random_student(rng) for _ in range(count)))
+    conn.commit()
+    conn.close()
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        op, weight = part.split("=")
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown operation {op!r}, choose from {', '.join(OPERATIONS)}")
+        mix[op] = float(weight)
+    return mix
+
+def op_add_student(rng, state):
+    state["max_id"] = max(state["max_id"], school_system.insert_student(*random_student(rng)))
+
+def op_delete_student(rng, state):
+    school_system.delete_student(rng.randint(1, state["max_id"]))
+
+def op_fetch_data(rng, state):
+    school_system.fetch_data()
+
+def op_fetch_totals(rng, state):
+    school_system.fetch_totals()
+
+def op_display_all(rng, state):
+    HeadlessView().display_all()
+
+OPERATIONS = {
+    "add_student": op_add_student,
+    "delete_student": op_delete_student,
+    "fetch_data": op_fetch_data,
+    "fetch_totals": op_fetch_totals,
+    "display_all": op_display_all,
+}
+
+def worker(seed, ops, mix, state, timings, errors, lock):
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    local = {name: [] for name in names}
+    failed = {name: 0 for name in names}
+    for name in rng.choices(names, weights, k=ops):
+        start = time.perf_counter()
+        try:
+            OPERATIONS[name](rng, state)
+        except Exception:
+            failed[name] += 1
+            continue
+        local[name].append(time.perf_counter() - start)
+    with lock:
+        for name in names:
+            timings[name].extend(local[name])
+            errors[name] += failed[name]
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+def run_workload(students, threads, ops, mix, seed=0):
+    folder = tempfile.mkdtemp(prefix="school_bench_")
+    db_path = os.path.join(folder, "school.db")
+    old_path = school_system.DB_PATH
+    try:
+        start = time.perf_counter()
+        populate(db_path, students, seed)
+        fill_time = time.perf_counter() - start
+        school_system.DB_PATH = db_path
+
+        state = {"max_id": students}
+        timings = {name: [] for name in mix}
+        errors = {name: 0 for name in mix}
+        lock = threading.Lock()
+        pool = [threading.Thread(target=worker, args=(seed + i + 1, ops, mix, state, timings, errors, lock))
+                for i in range(threads)]
+        start = time.perf_counter()
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        elapsed = time.perf_counter() - start
+
+        # Let the write queue finish before the folder is removed
+        school_system.get_write_queue(db_path).close()
+        school_system.write_queues.pop(os.path.abspath(db_path), None)
+    finally:
+        school_system.DB_PATH = old_path
+        shutil.rmtree(folder, ignore_errors=True)
+    return fill_time, elapsed, timings, errors
+
+def report(students, threads, fill_time, elapsed, timings, errors):
+    total = sum(len(v) for v in timings.values())
+    print(f"\n{students:,} students, {threads} threads  (fill {fill_time:.2f}s, "
+          f"workload {elapsed:.2f}s, {total / elapsed:,.0f} ops/s overall)")
+    print(f"{'operation':<16}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}"
+          f"{'p99 ms':>10}{'max ms':>10}{'ops/s':>10}")
+    for name, values in timings.items():
+        values = sorted(v * 1000 for v in values)
+        print(f"{name:<16}{len(values):>8}{errors[name]:>8}{percentile(values, 50):>10.2f}"
+              f"{percentile(values, 95):>10.2f}{percentile(values, 99):>10.2f}"
+              f"{(values[-1] if values else float('nan')):>10.2f}{len(values) / elapsed:>10.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark school_system database operations")
+    parser.add_argument("--students", default="10000", help="Roster sizes, comma separated (e.g. 10000,100000)")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=500, help="Operations per thread")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation=weight pairs, comma separated")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    for students in (int(n) for n in args.students.split(",")):
+        report(students, args.threads, *run_workload(students, args.threads, args.ops, mix, args.seed))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Startup benchmark: time from interpreter start to the first painted window
+#
+#   python bench_startup.py              (both apps, 5 runs each)
+#   python bench_startup.py result -n 10
+#
+# Needs a display (the window is really created, drawn and destroyed).
+# Each run happens in a fresh temp folder, so no databases are left behind.
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# app -> (window class, what its __main__ does before building the window)
+APPS = {
+    "result": ("ResultApp", ""),
+    "school_system": ("SchoolManagement", "app.use_session(app.default_session())"),
+}
+
+# Runs in a fresh interpreter; prints import time and time to first paint
+CHILD = """
+import sys
+import time
+sys.path.insert(0, {here!r})
+t0 = time.perf_counter()
+import {module} as app
+t1 = time.perf_counter()
+{setup}
+import tkinter
+root = tkinter.Tk()
+app.{cls}(root)
+root.update()
+t2 = time.perf_counter()
+root.destroy()
+print(f"{{(t1 - t0) * 1000:.2f}} {{(t2 - t0) * 1000:.2f}}")
+"""
+
+def run_once(name):
+    cls, setup = APPS[name]
+    code = CHILD.format(here=HERE, module=name, cls=cls, setup=setup)
+    with tempfile.TemporaryDirectory(prefix="startup_bench_") as folder:
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], cwd=folder, capture_output=True, text=True)
+        total = (time.perf_counter() - start) * 1000
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1])
+    import_ms, paint_ms = (float(x) for x in out.stdout.split())
+    return import_ms, paint_ms, total
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time and time to first paint")
+    parser.add_argument("apps", nargs="*", help="result and/or school_system (default: both)")
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    args = parser.parse_args()
+    for name in args.apps:
+        if name not in APPS:
+            parser.error(f"unknown app {name!r}, choose from {', '.join(APPS)}")
+
+    print(f"{'app':<15}{'import ms':>12}{'first paint ms':>16}{'process ms':>12}")
+    for name in args.apps or list(APPS):
+        try:
+            runs = [run_once(name) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{name:<15}failed: {e}")
+            continue
+        imports, paints, totals = zip(*runs)
+        print(f"{name:<15}{statistics.median(imports):>12.1f}"
+              f"{statistics.median(paints):>16.1f}{statistics.median(totals):>12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+# Local on-demand result card service
+# Serves /card/<roll_no> as a PDF, from an Excel sheet or from school.db
+#
+#   python card_server.py students.xlsx
+#   python card_server.py --db school.db --port 8080
+import argparse
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+from file_version import file_version
+from grading_scheme import load_scheme
+from result_card import card_bytes, detect_subjects, render_card, render_profile_card
+
+class DuplicateRollError(LookupError):
+    # More than one student in the sheet has this roll number
+    pass
+
+# --- Cache of rendered PDFs ---
+class CardCache:
+    # LRU cache that evicts the least recently used cards once max_bytes is exceeded
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.cards = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            data = self.cards.get(key)
+            if data is not None:
+                self.cards.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        with self.lock:
+            old = self.cards.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            if len(data) > self.max_bytes:
+                return
+            self.cards[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self.cards.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        with self.lock:
+            self.cards.clear()
+            self.size = 0
+
+# --- Data sources ---
+class SheetSource:
+    def __init__(self, path, scheme_path=None):
+        self.path = path
+        self.scheme_path = scheme_path
+
+    def version(self):
+        if self.scheme_path:
+            return file_version(self.path, self.scheme_path)
+        return file_version(self.path)
+
+    def load(self):
+        import pandas as pd
+        df = pd.read_excel(self.path)
+        df.columns = df.columns.str.strip()
+        subjects = detect_subjects(df)
+        scheme = load_scheme(self.scheme_path, self.path, subjects)
+        results = scheme.score(df, subjects)
+
+        records, names = {}, {}
+        for i, row in df.iterrows():
+            roll = str(row['Roll_No'])
+            names.setdefault(roll, []).append(str(row['Name']))
+            records[roll] = (row, subjects, results.loc[i], scheme)
+        # A shared roll number cannot pick one card, so those are refused
+        for roll, same_roll in names.items():
+            if len(same_roll) > 1:
+                records[roll] = DuplicateRollError(f"Roll no {roll} is used by {', '.join(same_roll)}")
+                print(f"Warning: {records[roll]}", file=sys.stderr)
+        return records
+
+    def render(self, record):
+        row, subjects, result, scheme = record
+        return render_card(row, subjects, result, scheme)
+
+class DbSource:
+    def __init__(self, path):
+        self.path = path
+
+    def version(self):
+        # Committed writes may still sit in the WAL file
+        return file_version(self.path, self.path + "-wal")
+
+    def load(self):
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute("SELECT id, name, age, grade, gender FROM students").fetchall()
+        conn.close()
+        return {str(row['id']): row for row in rows}
+
+    def render(self, record):
+        return render_profile_card(record)
+
+# --- Service ---
+class CardService:
+    def __init__(self, source, cache=None):
+        self.source = source
+        self.cache = cache or CardCache()
+        # (version, records) are swapped together so a request never mixes
+        # records from one load with the version of another
+        self.loaded = (None, {})
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        # Reload the source and drop every cached card when the data changed
+        version = self.source.version()
+        if version == self.loaded[0]:
+            return self.loaded
+        with self.lock:
+            if version != self.loaded[0]:
+                self.loaded = (version, self.source.load())
+                self.cache.clear()
+            return self.loaded
+
+    def get_card(self, roll_no):
+        version, records = self.refresh()
+        # The version is part of the key, so a card rendered from old data
+        # while another thread reloaded is never served for the new data
+        key = (version, roll_no)
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+        record = records.get(roll_no)
+        if record is None:
+            return None
+        if isinstance(record, DuplicateRollError):
+            raise record
+        data = card_bytes(self.source.render(record))
+        if self.loaded[0] == version:
+            self.cache.put(key, data)
+        return data
+
+def make_handler(service):
+    class CardHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            # Ignore ?query / #fragment and decode %XX in the roll number
+            parts = urlsplit(self.path).path.strip("/").split("/")
+            if len(parts) != 2 or parts[0] != "card":
+                self.send_error(404, "Use /card/<roll_no>")
+                return
+            roll_no = unquote(parts[1])
+            try:
+                data = service.get_card(roll_no)
+            except DuplicateRollError as e:
+                self.send_error(409, str(e))
+                return
+            except Exception as e:
+                self.send_error(500, f"An error occurred: {e}")
+                return
+            if data is None:
+                self.send_error(404, f"No student with roll no {roll_no}")
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("Content-Disposition", f'inline; filename="{parts[1]}.pdf"')   # still %-encoded, safe in a header
+            self.end_headers()
+            self.wfile.write(data)
+
+    return CardHandler
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve result cards on demand")
+    parser.add_argument("sheet", nargs="?", help="Excel file with Name, Roll_No and subject columns")
+    parser.add_argument("--scheme", help="Grading scheme JSON file (default: workbook 'Grading' sheet)")
+    parser.add_argument("--db", help="Serve cards from a school.db file instead of a sheet")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--cache-mb", type=int, default=32, help="Memory used for rendered cards")
+    args = parser.parse_args()
+
+    if args.db:
+        source = DbSource(args.db)
+    elif args.sheet:
+        source = SheetSource(args.sheet, args.scheme)
+    else:
+        parser.error("give an Excel file or --db")
+
+    service = CardService(source, CardCache(args.cache_mb * 1024 * 1024))
+    service.refresh()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    print(f"Serving cards on http://{args.host}:{args.port}/card/<roll_no>")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+
+if __name__ == "__main__":
+    main()
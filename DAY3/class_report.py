@@ -0,0 +1,123 @@
+# Class summary: per-subject mean / median / stddev, pass rate, grade
+# histogram and the top students, written as CSV plus a one-page PDF.
+# All statistics are percentages of each subject's max marks, so subjects
+# with different max marks and the Overall row share one unit. Subject rows
+# only count students with a mark; Overall uses the card percentages
+# (blank marks count as 0 there).
+import os
+import numpy as np
+import pandas as pd
+from fpdf import FPDF
+
+TOP_N = 5
+
+class SummaryPDF(FPDF):
+    def header(self):
+        self.set_font('helvetica', 'B', 15)
+        self.cell(0, 10, 'CLASS RESULT SUMMARY', 1, 1, 'C')
+        self.ln(5)
+
+def subject_stats(df, subjects, results, scheme):
+    # Long frame: one row per (student, subject), graded with the same scheme
+    marks = df[subjects].to_numpy(dtype=float)
+    max_m = np.array([scheme.max_marks(s) for s in subjects])
+    pct = marks / max_m * 100
+
+    long = pd.DataFrame({
+        "Subject": np.tile(subjects, len(df)),
+        "Pct": pct.ravel(),
+        "Passed": (pct >= scheme.pass_percentage).ravel(),
+        "Grade": scheme.grade_all(pct.ravel()),
+    })
+    # Blank marks are not graded, so they must not reach the histogram
+    long = long[long["Pct"].notna()]
+    # Overall result goes through the same groupby as an extra "subject"
+    overall = pd.DataFrame({
+        "Subject": "Overall",
+        "Pct": results["Percentage"].to_numpy(),
+        "Passed": (results["Percentage"] >= scheme.pass_percentage).to_numpy(),
+        "Grade": results["Grade"].to_numpy(),
+    })
+    long = pd.concat([long, overall], ignore_index=True)
+    long = long[long["Pct"].notna()].reset_index(drop=True)
+
+    # Highest grade first
+    grade_order = scheme.grades[::-1].tolist()
+    counts = pd.get_dummies(pd.Categorical(long["Grade"], categories=grade_order), dtype=int)
+    long = pd.concat([long, counts], axis=1)
+
+    # Single aggregation pass for every statistic
+    stats = long.groupby("Subject", sort=False).agg(
+        Students=("Pct", "count"),
+        Mean_Pct=("Pct", "mean"),
+        Median_Pct=("Pct", "median"),
+        Std_Pct=("Pct", "std"),
+        Pass_Rate=("Passed", "mean"),
+        **{grade: (grade, "sum") for grade in grade_order},
+    )
+    stats["Pass_Rate"] *= 100
+    # Keep the sheet's subject order (a subject with no marks at all is left out)
+    stats = stats.reindex([s for s in list(subjects) + ["Overall"] if s in stats.index])
+    return stats.round(2)
+
+def top_students(df, results, n=TOP_N):
+    top = results.nlargest(n, "Percentage")
+    return pd.DataFrame({
+        "Roll_No": df.loc[top.index, "Roll_No"],
+        "Name": df.loc[top.index, "Name"],
+        "Percentage": top["Percentage"].round(2),
+        "Grade": top["Grade"],
+    })
+
+def write_summary_pdf(stats, top, scheme, path):
+    pdf = SummaryPDF(orientation='L')
+    # The summary is always one page: rows and text shrink to fit long subject lists
+    pdf.set_auto_page_break(False)
+    pdf.add_page()
+    pdf.set_font('helvetica', '', 10)
+    pdf.cell(0, 8, f"Grading scheme: {scheme.name}  |  Pass mark: {scheme.pass_percentage:g}%", 0, 1)
+    pdf.ln(2)
+    # Space left after the "Top N Students" heading (6 + 8) and a 10 mm bottom margin
+    table_rows = (len(stats) + 1) + (len(top) + 1)
+    h = min(8, (pdf.h - 10 - pdf.get_y() - 14) / table_rows)
+    size = min(9, h * 9 / 8)
+
+    # Subject statistics + grade histogram (one row per subject)
+    cols = list(stats.columns)
+    widths = [40] + [(277 - 40) / len(cols)] * len(cols)
+    pdf.set_font('helvetica', 'B', size)
+    pdf.set_fill_color(230, 230, 230)
+    for title, w in zip(["Subject"] + [c.replace("_", " ") for c in cols], widths):
+        pdf.cell(w, h, title, 1, 0, 'C', 1)
+    pdf.ln()
+    pdf.set_font('helvetica', '', size)
+    for subject, row in stats.iterrows():
+        pdf.cell(widths[0], h, str(subject), 1)
+        for c, w in zip(cols, widths[1:]):
+            val = row[c]
+            pdf.cell(w, h, "-" if pd.isna(val) else f"{val:g}", 1, 0, 'C')
+        pdf.ln()
+
+    # Top students
+    pdf.ln(6)
+    pdf.set_font('helvetica', 'B', 12)
+    pdf.cell(0, 8, f"Top {len(top)} Students", 0, 1)
+    pdf.set_font('helvetica', 'B', size)
+    for title, w in (("Roll No", 30), ("Name", 80), ("Percentage", 40), ("Grade", 30)):
+        pdf.cell(w, h, title, 1, 0, 'C', 1)
+    pdf.ln()
+    pdf.set_font('helvetica', '', size)
+    for _, row in top.iterrows():
+        pdf.cell(30, h, str(row["Roll_No"]), 1, 0, 'C')
+        pdf.cell(80, h, str(row["Name"]), 1)
+        pdf.cell(40, h, f"{row['Percentage']:.2f}%", 1, 0, 'C')
+        pdf.cell(30, h, str(row["Grade"]), 1, 0, 'C')
+        pdf.ln()
+    pdf.output(path)
+
+def write_class_report(df, subjects, results, scheme, output_dir):
+    stats = subject_stats(df, subjects, results, scheme)
+    top = top_students(df, results)
+    stats.to_csv(os.path.join(output_dir, "class_summary.csv"))
+    write_summary_pdf(stats, top, scheme, os.path.join(output_dir, "class_summary.pdf"))
+    return stats
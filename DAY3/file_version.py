@@ -0,0 +1,14 @@
+# Cheap change detection for the workbook / database files that the card
+# server and the watch mode reload from
+import os
+
+def file_version(*paths):
+    # Changes whenever one of the files is written (mtime + size)
+    version = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            version.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            version.append(None)
+    return tuple(version)
@@ -0,0 +1,151 @@
+# Grading schemes: grade bands plus per-subject max marks and weights
+#
+# A scheme comes from (first match wins):
+#   1. a JSON file, e.g. grading_scheme_example.json
+#   2. a "Grading" sheet in the results workbook (Subject, Max_Marks, Weight)
+#      with an optional "Grade_Bands" sheet (Grade, Min_Percentage, optional Pass_Mark)
+#   3. DEFAULT_BANDS with every subject out of 100
+#
+# A blank mark cell counts as 0 (absent) in both Total and Percentage.
+# pass_mark is the percentage needed to pass; when a scheme does not set it,
+# the second-lowest band is the pass mark (40 for the default D band).
+import bisect
+import json
+import numpy as np
+
+DEFAULT_BANDS = {"A+": 80, "A": 70, "B": 60, "C": 50, "D": 40, "F": 0}
+DEFAULT_MAX = 100
+
+class GradingScheme:
+    def __init__(self, bands=None, subjects=None, default_max=DEFAULT_MAX, name="default", pass_mark=None):
+        self.name = name
+        self.default_max = float(default_max)
+        # subjects: {"Computer": {"max": 50, "weight": 1}}
+        self.subjects = subjects or {}
+        # NaN passes a plain "<= 0" check, so every number must also be finite
+        for subject, cfg in self.subjects.items():
+            max_m = float(cfg.get("max", self.default_max))
+            if not np.isfinite(max_m) or max_m <= 0:
+                raise ValueError(f"Max marks for {subject} must be a number more than 0")
+            weight = float(cfg.get("weight", 1))
+            if not np.isfinite(weight) or weight < 0:
+                raise ValueError(f"Weight for {subject} must be a number of 0 or more")
+        if not np.isfinite(self.default_max) or self.default_max <= 0:
+            raise ValueError("default_max must be a number more than 0")
+
+        # Compile the bands once into ascending threshold / grade arrays
+        bands = sorted((DEFAULT_BANDS if bands is None else bands).items(), key=lambda band: band[1])
+        if not bands:
+            raise ValueError("A grading scheme needs at least one grade band")
+        for grade, low in bands:
+            if not np.isfinite(float(low)):
+                raise ValueError(f"Grade band {grade} needs a minimum percentage")
+        self.thresholds = np.array([float(low) for _, low in bands])
+        self.grades = np.array([grade for grade, _ in bands], dtype=object)
+        self.lowest_grade = self.grades[0]
+
+        if pass_mark is None:
+            pass_mark = self.thresholds[1] if len(self.thresholds) > 1 else self.thresholds[0]
+        self.pass_percentage = float(pass_mark)
+        if not np.isfinite(self.pass_percentage):
+            raise ValueError("pass_mark must be a number")
+
+    def max_marks(self, subject):
+        return float(self.subjects.get(subject, {}).get("max", self.default_max))
+
+    def weight(self, subject):
+        return float(self.subjects.get(subject, {}).get("weight", 1))
+
+    def grade(self, pct):
+        # NaN / inf sort after every threshold; they get the lowest grade instead
+        if not np.isfinite(pct):
+            return self.lowest_grade
+        i = bisect.bisect_right(self.thresholds.tolist(), pct) - 1
+        return self.grades[max(i, 0)]
+
+    def grade_all(self, pct):
+        # One searchsorted over the whole cohort instead of an if/elif per student
+        pct = np.asarray(pct, dtype=float)
+        idx = np.searchsorted(self.thresholds, pct, side="right") - 1
+        grades = self.grades[np.clip(idx, 0, None)]
+        return np.where(np.isfinite(pct), grades, self.lowest_grade)
+
+    def check_weights(self, subjects):
+        if sum(self.weight(s) for s in subjects) <= 0:
+            raise ValueError(f"Grading scheme '{self.name}' gives every subject a weight of 0")
+
+    def score(self, df, subjects):
+        # Total, Max_Marks, Percentage and Grade for every row of df
+        import pandas as pd
+        self.check_weights(subjects)
+        # Blank marks count as 0 so Total and Percentage agree
+        marks = np.nan_to_num(df[subjects].to_numpy(dtype=float), nan=0.0)
+        max_m = np.array([self.max_marks(s) for s in subjects])
+        weights = np.array([self.weight(s) for s in subjects])
+
+        pct = (marks / max_m * weights).sum(axis=1) / weights.sum() * 100
+        return pd.DataFrame({
+            "Total": marks.sum(axis=1),
+            "Max_Marks": max_m.sum(),
+            "Percentage": pct,
+            "Grade": self.grade_all(pct),
+        }, index=df.index)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "bands": dict(zip(self.grades.tolist(), self.thresholds.tolist())),
+            "default_max": self.default_max,
+            "subjects": self.subjects,
+            "pass_mark": self.pass_percentage,
+        }
+
+DEFAULT_SCHEME = GradingScheme()
+
+def scheme_from_json(path):
+    with open(path) as f:
+        data = json.load(f)
+    return GradingScheme(data.get("bands"), data.get("subjects"),
+                         data.get("default_max", DEFAULT_MAX), data.get("name", path), data.get("pass_mark"))
+
+def scheme_from_workbook(path):
+    # None when the workbook has no "Grading" sheet
+    import pandas as pd
+    sheets = pd.ExcelFile(path).sheet_names
+    if "Grading" not in sheets:
+        return None
+
+    grading = pd.read_excel(path, sheet_name="Grading")
+    grading.columns = grading.columns.str.strip()
+    subjects = {}
+    for _, row in grading.iterrows():
+        if pd.isna(row["Subject"]):
+            continue
+        if pd.isna(row["Max_Marks"]):
+            raise ValueError(f"Max_Marks is blank for {str(row['Subject']).strip()} on the Grading sheet")
+        cfg = {"max": float(row["Max_Marks"])}
+        if "Weight" in grading.columns and not pd.isna(row["Weight"]):
+            cfg["weight"] = float(row["Weight"])
+        subjects[str(row["Subject"]).strip()] = cfg
+
+    bands = None
+    pass_mark = None
+    if "Grade_Bands" in sheets:
+        band_df = pd.read_excel(path, sheet_name="Grade_Bands")
+        band_df.columns = band_df.columns.str.strip()
+        bands = {str(g).strip(): float(low) for g, low in zip(band_df["Grade"], band_df["Min_Percentage"])}
+        if "Pass_Mark" in band_df.columns and band_df["Pass_Mark"].notna().any():
+            pass_mark = float(band_df["Pass_Mark"].dropna().iloc[0])
+    return GradingScheme(bands, subjects, name=f"{path} [Grading]", pass_mark=pass_mark)
+
+def load_scheme(scheme_path=None, workbook=None, subjects=None):
+    # With subjects given, a scheme that weights all of them 0 is rejected here
+    scheme = None
+    if scheme_path:
+        scheme = scheme_from_json(scheme_path)
+    elif workbook:
+        scheme = scheme_from_workbook(workbook)
+    scheme = scheme or DEFAULT_SCHEME
+    if subjects is not None:
+        scheme.check_weights(subjects)
+    return scheme
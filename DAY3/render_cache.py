@@ -0,0 +1,124 @@
+# Shared on-disk cache of rendered result cards
+#
+# Cards are stored by a fingerprint of everything that goes into them (the
+# row values as printed, subjects, grading scheme, template and fpdf
+# version), so a folder can be shared between runs, workers and machines.
+# A cache hit is a hardlink (or a copy across drives) instead of a render.
+# Least recently used cards are evicted once the folder grows past max_bytes.
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import fpdf
+from result_card import TEMPLATE_VERSION
+
+DEFAULT_CACHE_DIR = os.environ.get("RESULT_CARD_CACHE", ".card_cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+def card_fingerprint(row, subjects, scheme):
+    # Values are normalized to the text the card prints, so 85 read as an
+    # int or as numpy.int64 gives the same key
+    data = {
+        "template": TEMPLATE_VERSION,
+        "fpdf": fpdf.FPDF_VERSION,
+        "fields": [[col, str(row[col])] for col in ['Name', 'Roll_No'] + list(subjects)],
+        "scheme": {k: v for k, v in scheme.to_dict().items() if k != "name"},
+    }
+    text = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class RenderCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.size = sum(size for _, _, size in self.entries())
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.pdf")
+
+    def entries(self):
+        # [(mtime, path, size)] for every cached card
+        found = []
+        for folder, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".pdf"):
+                    path = os.path.join(folder, name)
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    found.append((st.st_mtime, path, st.st_size))
+        return found
+
+    def place(self, cached, target):
+        # Hardlink the cached card to target, or copy when linking is not possible
+        if os.path.exists(target):
+            os.remove(target)
+        try:
+            os.link(cached, target)
+        except OSError:
+            shutil.copyfile(cached, target)
+
+    def get(self, key, target):
+        # True (and target written) on a hit
+        cached = self.path_for(key)
+        if not os.path.exists(cached):
+            return False
+        try:
+            os.utime(cached)   # mark as recently used
+        except FileNotFoundError:
+            return False
+        except OSError:
+            pass               # read-only shared cache: LRU order is best-effort
+        self.place(cached, target)
+        return True
+
+    def put(self, key, pdf, target):
+        cached = self.path_for(key)
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        # Write to a temp file first so other workers never see half a card
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(cached))
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf.output())
+        os.chmod(tmp, 0o644)   # mkstemp files are private; cards are shared
+        os.replace(tmp, cached)
+        self.place(cached, target)
+        with self.lock:
+            self.size += os.path.getsize(cached)
+            if self.size > self.max_bytes:
+                self.evict()
+
+    def evict(self):
+        # Drop least recently used cards until the cache is back under 90% of max_bytes
+        entries = sorted(self.entries())
+        self.size = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if self.size <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue       # not ours to delete (read-only share)
+            self.size -= size
+
+    def render_to(self, row, subjects, result, scheme, target, render):
+        # Write the card for row to target, rendering only on a cache miss
+        key = card_fingerprint(row, subjects, scheme)
+        if self.get(key, target):
+            return True
+        pdf = render(row, subjects, result, scheme)
+        try:
+            self.put(key, pdf, target)
+        except PermissionError:
+            # Cache folder is read-only for us: still write the card itself
+            if os.path.exists(target):
+                os.remove(target)
+            pdf.output(target)
+        return False
@@ -1,20 +1,20 @@
-import pandas as pd
-from fpdf import FPDF
 import os
+import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
-class ResultPDF(FPDF):
-    def header(self):
-        self.set_font('helvetica', 'B', 15)
-        self.cell(0, 10, 'OFFICIAL STUDENT REPORT CARD', 1, 1, 'C')
-        self.ln(10)
+# pandas and fpdf take seconds to import, so they are loaded after the
+# window is on screen (see warm_imports) or on first use
+
+def warm_imports():
+    import pandas
+    import batch_results
 
 class ResultApp:
     def __init__(self, root):
         self.root = root
         self.root.title("School Result Generator Pro")
-        self.root.geometry("500x350")
+        self.root.geometry("500x460")
         self.root.configure(bg="#f0f0f0")
 
         # UI Elements
@@ -25,14 +25,28 @@ class ResultApp:
 
         tk.Button(root, text="Step 1: Select Excel File", command=self.select_file, width=25).pack(pady=10)
         
+        self.scheme_label = tk.Label(root, text="Grading: workbook 'Grading' sheet or default", fg="blue", bg="#f0f0f0")
+        self.scheme_label.pack(pady=5)
+        tk.Button(root, text="Optional: Select Grading Scheme", command=self.select_scheme, width=25).pack(pady=5)
+
         self.process_btn = tk.Button(root, text="Step 2: Generate PDF Cards", command=self.process_data, 
                                      state=tk.DISABLED, width=25, bg="green", fg="white")
         self.process_btn.pack(pady=10)
 
+        self.watch_var = tk.BooleanVar()
+        tk.Checkbutton(root, text="Watch file and update changed cards on save", variable=self.watch_var,
+                       command=self.toggle_watch, bg="#f0f0f0").pack()
+
         self.status_label = tk.Label(root, text="", bg="#f0f0f0")
         self.status_label.pack(pady=10)
 
         self.selected_path = ""
+        self.scheme_path = ""
+        self.watcher = None
+
+        # Load pandas / fpdf in the background once the window has been drawn
+        self.root.after(100, lambda: threading.Thread(target=warm_imports, daemon=True).start())
+        self.root.after(500, self.poll_watcher)
 
     def select_file(self):
         file_path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx")])
@@ -40,68 +54,66 @@ class ResultApp:
             self.selected_path = file_path
             self.file_label.config(text=os.path.basename(file_path))
             self.process_btn.config(state=tk.NORMAL)
+            # Keep watching, but the newly selected file
+            self.toggle_watch()
+
+    def select_scheme(self):
+        file_path = filedialog.askopenfilename(filetypes=[("Grading scheme", "*.json")])
+        if file_path:
+            self.scheme_path = file_path
+            self.scheme_label.config(text=f"Grading: {os.path.basename(file_path)}")
 
     def calculate_grade(self, pct):
-        if pct >= 80: return "A+"
-        elif pct >= 70: return "A"
-        elif pct >= 60: return "B"
-        elif pct >= 50: return "C"
-        elif pct >= 40: return "D"
-        else: return "F"
+        from result_card import calculate_grade
+        return calculate_grade(pct)
 
     def process_data(self):
         try:
-            df = pd.read_excel(self.selected_path)
-            df.columns = df.columns.str.strip()
-            
-            # Dynamic Subject Detection
-            non_subjects = ['Name', 'Roll_No']
-            subjects = [col for col in df.columns if col not in non_subjects]
-            
-            output_dir = "Generated_Results"
-            if not os.path.exists(output_dir):
-                os.makedirs(output_dir)
-
-            for _, row in df.iterrows():
-                pdf = ResultPDF()
-                pdf.add_page()
-                
-                # Info
-                pdf.set_font('helvetica', 'B', 12)
-                pdf.cell(0, 10, f"Name: {row['Name']}", 0, 1)
-                pdf.cell(0, 10, f"Roll No: {row['Roll_No']}", 0, 1)
-                pdf.ln(5)
-
-                # Table Header
-                pdf.set_fill_color(230, 230, 230)
-                pdf.cell(90, 10, "Subject", 1, 0, 'C', 1)
-                pdf.cell(0, 10, "Marks", 1, 1, 'C', 1)
-
-                total = 0
-                for sub in subjects:
-                    val = row[sub]
-                    pdf.set_font('helvetica', '', 12)
-                    pdf.cell(90, 10, sub, 1)
-                    pdf.cell(0, 10, str(val), 1, 1, 'C')
-                    total += val
-
-                # Calculations
-                max_m = len(subjects) * 100
-                pct = (total / max_m) * 100
-                grade = self.calculate_grade(pct)
-
-                pdf.ln(5)
-                pdf.set_font('helvetica', 'B', 12)
-                pdf.cell(0, 10, f"Total: {total}/{max_m}  |  Percentage: {pct:.2f}%", 0, 1)
-                pdf.cell(0, 10, f"Grade: {grade}", 0, 1)
-
-                pdf.output(f"{output_dir}/{row['Roll_No']}_{row['Name']}.pdf")
-
-            messagebox.showinfo("Success", f"Results generated in '{output_dir}' folder!")
+            from batch_results import OUTPUT_DIR, card_label, generate_results
+            from render_cache import RenderCache
+
+            batch = generate_results(self.selected_path, self.scheme_path, OUTPUT_DIR, RenderCache())
+            if self.watch_var.get():
+                self.start_watcher(batch)
+
+            duplicates = batch.duplicates()
+            if duplicates:
+                messagebox.showwarning("Duplicate students", "These appear more than once, only one card each was kept:\n"
+                                       + "\n".join(card_label(key) for key in duplicates))
+            messagebox.showinfo("Success", f"Results and class summary generated in '{OUTPUT_DIR}' folder!")
             
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {e}")
 
+    def start_watcher(self, batch=None):
+        from batch_results import OUTPUT_DIR, WorkbookWatcher
+        from render_cache import RenderCache
+
+        self.watcher = WorkbookWatcher(self.selected_path, self.scheme_path, OUTPUT_DIR, batch, RenderCache())
+        self.status_label.config(text=f"Watching {os.path.basename(self.selected_path)} for changes...")
+
+    def toggle_watch(self):
+        if not self.watch_var.get():
+            self.watcher = None
+            self.status_label.config(text="")
+        elif self.selected_path:
+            try:
+                self.start_watcher()
+            except Exception as e:
+                self.watch_var.set(False)
+                messagebox.showerror("Error", f"Could not watch the file: {e}")
+
+    def poll_watcher(self):
+        # Re-render only the students whose rows changed since the last save
+        if self.watcher is not None:
+            try:
+                updated = self.watcher.check()
+                if updated:
+                    self.status_label.config(text=f"Updated cards: {', '.join(updated)}")
+            except Exception as e:
+                self.status_label.config(text=f"Watch error: {e}")
+        self.root.after(500, self.poll_watcher)
+
 if __name__ == "__main__":
     root = tk.Tk()
     app = ResultApp(root)
@@ -0,0 +1,83 @@
+import datetime
+from fpdf import FPDF
+from grading_scheme import DEFAULT_SCHEME
+
+# Columns in the sheet that are not subjects
+NON_SUBJECTS = ['Name', 'Roll_No']
+
+# Bump whenever the card layout changes, so cached cards are not reused
+TEMPLATE_VERSION = 3
+
+# Fixed creation date so the same data always gives byte-identical PDFs
+# (fpdf derives the document /ID from the content, so it is fixed too)
+CREATION_DATE = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+
+class ResultPDF(FPDF):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.creation_date = CREATION_DATE
+
+    def header(self):
+        self.set_font('helvetica', 'B', 15)
+        self.cell(0, 10, 'OFFICIAL STUDENT REPORT CARD', 1, 1, 'C')
+        self.ln(10)
+
+def calculate_grade(pct, scheme=DEFAULT_SCHEME):
+    return scheme.grade(pct)
+
+def detect_subjects(df):
+    # Every column that is not Name / Roll_No is a subject
+    return [col for col in df.columns if col not in NON_SUBJECTS]
+
+def render_card(row, subjects, result, scheme=DEFAULT_SCHEME):
+    # result is this student's row from scheme.score(df, subjects)
+    pdf = ResultPDF()
+    pdf.add_page()
+
+    # Info
+    pdf.set_font('helvetica', 'B', 12)
+    pdf.cell(0, 10, f"Name: {row['Name']}", 0, 1)
+    pdf.cell(0, 10, f"Roll No: {row['Roll_No']}", 0, 1)
+    pdf.ln(5)
+
+    # Table Header
+    pdf.set_fill_color(230, 230, 230)
+    pdf.cell(90, 10, "Subject", 1, 0, 'C', 1)
+    pdf.cell(50, 10, "Marks", 1, 0, 'C', 1)
+    pdf.cell(0, 10, "Out of", 1, 1, 'C', 1)
+
+    pdf.set_font('helvetica', '', 12)
+    for sub in subjects:
+        pdf.cell(90, 10, sub, 1)
+        val = row[sub]
+        pdf.cell(50, 10, "Absent" if val != val else str(val), 1, 0, 'C')   # blank cell (NaN) counts as 0
+        pdf.cell(0, 10, f"{scheme.max_marks(sub):g}", 1, 1, 'C')
+
+    pdf.ln(5)
+    pdf.set_font('helvetica', 'B', 12)
+    pdf.cell(0, 10, f"Total: {result['Total']:g}/{result['Max_Marks']:g}  |  "
+                    f"Percentage: {result['Percentage']:.2f}%", 0, 1)
+    pdf.cell(0, 10, f"Grade: {result['Grade']}", 0, 1)
+    return pdf
+
+def render_profile_card(row):
+    # Card for a school.db record (id, name, age, grade, gender) - no marks there
+    pdf = ResultPDF()
+    pdf.add_page()
+    pdf.set_font('helvetica', 'B', 12)
+    pdf.cell(0, 10, f"Name: {row['name']}", 0, 1)
+    pdf.cell(0, 10, f"Roll No: {row['id']}", 0, 1)
+    pdf.ln(5)
+
+    pdf.set_fill_color(230, 230, 230)
+    pdf.cell(90, 10, "Field", 1, 0, 'C', 1)
+    pdf.cell(0, 10, "Value", 1, 1, 'C', 1)
+    pdf.set_font('helvetica', '', 12)
+    for field in ('age', 'grade', 'gender'):
+        pdf.cell(90, 10, field.capitalize(), 1)
+        pdf.cell(0, 10, str(row[field]), 1, 1, 'C')
+    return pdf
+
+def card_bytes(pdf):
+    # Rendered PDF as bytes (for serving / caching instead of writing a file)
+    return bytes(pdf.output())
@@ -1,63 +1,252 @@
+import atexit
+import datetime
+import glob
+import os
+import re
 import sqlite3
 from tkinter import *
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, simpledialog
+from write_queue import WriteQueue
 
 # --- Database Setup ---
-def initialize_db():
-    conn = sqlite3.connect("school.db")
+# One database file per academic session (school_2025-26.db, ...) so the
+# files the UI works on stay small. The old single school.db is still
+# available as the "legacy" session, and is what the app opens on until the
+# current session's database has been created (see default_session).
+LEGACY_SESSION = "legacy"
+ARCHIVE_DIR = "archive"
+ATTACH_LIMIT = 8   # SQLite allows 10 attached databases by default
+TOTALS_POLL_MS = 1000   # how often the totals label re-reads the summary tables
+
+def current_session(today=None):
+    # Sessions start in August: Oct 2025 -> "2025-26", Mar 2026 -> "2025-26"
+    today = today or datetime.date.today()
+    start = today.year if today.month >= 8 else today.year - 1
+    return f"{start}-{(start + 1) % 100:02d}"
+
+def session_db(session, folder="."):
+    if session == LEGACY_SESSION:
+        return os.path.join(folder, "school.db")
+    return os.path.join(folder, f"school_{session}.db")
+
+def list_sessions(folder="."):
+    # [(session, path)] oldest first; legacy school.db counts as the oldest
+    shards = []
+    if os.path.exists(os.path.join(folder, "school.db")):
+        shards.append((LEGACY_SESSION, os.path.join(folder, "school.db")))
+    for path in sorted(glob.glob(os.path.join(folder, "school_*.db"))):
+        shards.append((os.path.basename(path)[len("school_"):-len(".db")], path))
+    return shards
+
+def default_session(folder="."):
+    # The session the app opens on. Right after upgrading, the roster is only
+    # in school.db: stay on "legacy" until the current session's database
+    # exists (it is created once someone switches to that session)
+    if os.path.exists(session_db(current_session(), folder)):
+        return current_session()
+    legacy = session_db(LEGACY_SESSION, folder)
+    if not os.path.exists(legacy):
+        return current_session()
+    try:
+        conn = sqlite3.connect(f"file:{os.path.abspath(legacy)}?mode=ro", uri=True)
+        try:
+            has_students = conn.execute("SELECT EXISTS (SELECT 1 FROM students)").fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return current_session()
+    return LEGACY_SESSION if has_students else current_session()
+
+SESSION = default_session()
+DB_PATH = session_db(SESSION)
+
+def check_session(session):
+    # Session names become file names, so only "2025-26" style names or "legacy"
+    if session == LEGACY_SESSION:
+        return
+    if not re.fullmatch(r"\d{4}-\d{2}", session):
+        raise ValueError(f"'{session}' is not a session name like {current_session()}")
+    start, end = session.split("-")
+    if (int(start) + 1) % 100 != int(end):
+        raise ValueError(f"'{session}' should end in {(int(start) + 1) % 100:02d}")
+
+def use_session(session):
+    # Point every backend function at this session's database. DB_PATH only
+    # changes once the database has been opened and set up successfully.
+    global DB_PATH, SESSION
+    check_session(session)
+    path = session_db(session)
+    initialize_db(path)
+    DB_PATH = path
+    SESSION = session
+
+def connect(db_path=None):
+    return sqlite3.connect(db_path or DB_PATH)
+
+# Inserts and deletes go through one group-commit queue per database file
+write_queues = {}
+
+def get_write_queue(db_path=None):
+    path = os.path.abspath(db_path or DB_PATH)
+    if path not in write_queues:
+        write_queues[path] = WriteQueue(path)
+    return write_queues[path]
+
+@atexit.register
+def close_write_queues():
+    for write_queue in write_queues.values():
+        write_queue.close()
+
+# Counts by grade and gender, kept up to date by triggers on students so
+# the totals never need a full-table scan
+# One statement per entry: initialize_db runs them with execute() inside its
+# own transaction (executescript would commit part way through)
+TOTALS_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS grade_totals (
+        grade TEXT PRIMARY KEY,
+        total INTEGER NOT NULL DEFAULT 0
+    )""",
+    """CREATE TABLE IF NOT EXISTS gender_totals (
+        gender TEXT PRIMARY KEY,
+        total INTEGER NOT NULL DEFAULT 0
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS students_totals_insert AFTER INSERT ON students
+    BEGIN
+        INSERT INTO grade_totals (grade, total) VALUES (COALESCE(NEW.grade, ''), 1)
+            ON CONFLICT (grade) DO UPDATE SET total = total + 1;
+        INSERT INTO gender_totals (gender, total) VALUES (COALESCE(NEW.gender, ''), 1)
+            ON CONFLICT (gender) DO UPDATE SET total = total + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS students_totals_delete AFTER DELETE ON students
+    BEGIN
+        UPDATE grade_totals SET total = total - 1 WHERE grade = COALESCE(OLD.grade, '');
+        UPDATE gender_totals SET total = total - 1 WHERE gender = COALESCE(OLD.gender, '');
+        DELETE FROM grade_totals WHERE grade = COALESCE(OLD.grade, '') AND total <= 0;
+        DELETE FROM gender_totals WHERE gender = COALESCE(OLD.gender, '') AND total <= 0;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS students_totals_update AFTER UPDATE OF grade, gender ON students
+    BEGIN
+        UPDATE grade_totals SET total = total - 1 WHERE grade = COALESCE(OLD.grade, '');
+        UPDATE gender_totals SET total = total - 1 WHERE gender = COALESCE(OLD.gender, '');
+        DELETE FROM grade_totals WHERE grade = COALESCE(OLD.grade, '') AND total <= 0;
+        DELETE FROM gender_totals WHERE gender = COALESCE(OLD.gender, '') AND total <= 0;
+        INSERT INTO grade_totals (grade, total) VALUES (COALESCE(NEW.grade, ''), 1)
+            ON CONFLICT (grade) DO UPDATE SET total = total + 1;
+        INSERT INTO gender_totals (gender, total) VALUES (COALESCE(NEW.gender, ''), 1)
+            ON CONFLICT (gender) DO UPDATE SET total = total + 1;
+    END""",
+]
+
+def initialize_db(db_path=None):
+    # Tables, triggers and the one-time backfill share one write transaction,
+    # so windows opening the same database at once cannot both backfill
+    conn = sqlite3.connect(db_path or DB_PATH, timeout=30, isolation_level=None)
     cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS students (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            age INTEGER,
-            grade TEXT,
-            gender TEXT
-        )
-    """)
-    conn.commit()
-    conn.close()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS students (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                age INTEGER,
+                grade TEXT,
+                gender TEXT
+            )
+        """)
+        # Checked after taking the write lock: another window may have just created them
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='grade_totals'")
+        new_totals = cursor.fetchone() is None
+        for statement in TOTALS_SCHEMA:
+            cursor.execute(statement)
+        if new_totals:
+            # Existing database: count the students already enrolled once
+            cursor.execute("""
+                INSERT INTO grade_totals (grade, total)
+                SELECT COALESCE(grade, ''), COUNT(*) FROM students GROUP BY 1
+            """)
+            cursor.execute("""
+                INSERT INTO gender_totals (gender, total)
+                SELECT COALESCE(gender, ''), COUNT(*) FROM students GROUP BY 1
+            """)
+        cursor.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
 
 # --- Backend Functions ---
-def add_student(name, age, grade, gender):
+def add_student(name, age, grade, gender, db_path=None):
+    # Queues the insert and returns its Future (None if a field is missing);
+    # the window waits for it without blocking, see SchoolManagement.when_written
     if name == "" or age == "" or grade == "":
         messagebox.showerror("Error", "Please fill all fields")
-        return
-    conn = sqlite3.connect("school.db")
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO students (name, age, grade, gender) VALUES (?, ?, ?, ?)", 
-                   (name, age, grade, gender))
-    conn.commit()
-    conn.close()
-    messagebox.showinfo("Success", "Student added successfully!")
+        return None
+    return get_write_queue(db_path).insert_student(name, age, grade, gender)
 
-def fetch_data():
-    conn = sqlite3.connect("school.db")
+def insert_student(name, age, grade, gender, db_path=None):
+    # Waits until the batch holding this insert has committed; returns the new id
+    student_id, _ = get_write_queue(db_path).insert_student(name, age, grade, gender).result()
+    return student_id
+
+def fetch_data(db_path=None):
+    conn = connect(db_path)
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM students")
     rows = cursor.fetchall()
     conn.close()
     return rows
 
-def delete_student(student_id):
-    conn = sqlite3.connect("school.db")
+def fetch_totals(db_path=None):
+    # Reads the small summary tables, not students
+    conn = connect(db_path)
     cursor = conn.cursor()
-    cursor.execute("DELETE FROM students WHERE id=?", (student_id,))
-    conn.commit()
+    cursor.execute("SELECT grade, total FROM grade_totals ORDER BY grade")
+    grades = cursor.fetchall()
+    cursor.execute("SELECT gender, total FROM gender_totals ORDER BY gender")
+    genders = cursor.fetchall()
+    conn.close()
+    return grades, genders
+
+def delete_student(student_id, db_path=None):
+    get_write_queue(db_path).delete_student(student_id).result()
+
+def search_all_sessions(name, include_archive=False):
+    # Cross-session lookup: ATTACH the shards (a few at a time) to one
+    # connection and UNION ALL their students tables
+    shards = list_sessions()
+    if include_archive:
+        shards = list_sessions(ARCHIVE_DIR) + shards
+    conn = sqlite3.connect("file::memory:", uri=True)
+    results = []
+    for start in range(0, len(shards), ATTACH_LIMIT):
+        chunk = shards[start:start + ATTACH_LIMIT]
+        queries, params = [], []
+        for i, (session, path) in enumerate(chunk):
+            conn.execute(f"ATTACH DATABASE ? AS s{i}", (f"file:{os.path.abspath(path)}?mode=ro",))
+            queries.append(f"SELECT ?, id, name, age, grade, gender FROM s{i}.students WHERE name LIKE ?")
+            params += [session, f"%{name}%"]
+        results += conn.execute(" UNION ALL ".join(queries), params).fetchall()
+        for i in range(len(chunk)):
+            conn.execute(f"DETACH DATABASE s{i}")
     conn.close()
+    return results
 
 # --- UI Setup ---
 class SchoolManagement:
     def __init__(self, root):
         self.root = root
         self.root.title("School Management System")
-        self.root.geometry("800x500")
+        self.root.geometry("800x540")
 
         # Variables
         self.name_var = StringVar()
         self.age_var = StringVar()
         self.grade_var = StringVar()
         self.gender_var = StringVar()
+        self.session = SESSION
+        self.session_var = StringVar(value=self.session)
 
         # Title
         title = Label(self.root, text="Student Management System", font=("Arial", 20, "bold"), bg="blue", fg="white")
@@ -67,6 +256,12 @@ class SchoolManagement:
         manage_frame = Frame(self.root, bd=4, relief=RIDGE, bg="silver")
         manage_frame.place(x=20, y=70, width=300, height=400)
 
+        Label(manage_frame, text="Session:", bg="silver").grid(row=0, column=0, pady=10, padx=5, sticky="w")
+        self.combo_session = ttk.Combobox(manage_frame, textvariable=self.session_var, state="readonly")
+        self.combo_session['values'] = self.session_names()
+        self.combo_session.grid(row=0, column=1, pady=10, padx=5)
+        self.combo_session.bind("<<ComboboxSelected>>", self.change_session)
+
         Label(manage_frame, text="Name:", bg="silver").grid(row=1, column=0, pady=10, padx=5, sticky="w")
         Entry(manage_frame, textvariable=self.name_var).grid(row=1, column=1, pady=10, padx=5)
 
@@ -83,11 +278,14 @@ class SchoolManagement:
 
         # Buttons
         btn_frame = Frame(manage_frame, bg="silver")
-        btn_frame.place(x=10, y=300, width=270)
+        btn_frame.place(x=10, y=290, width=270)
         
         Button(btn_frame, text="Add", width=10, command=self.save_data).grid(row=0, column=0, padx=5)
         Button(btn_frame, text="Delete", width=10, command=self.remove_data).grid(row=0, column=1, padx=5)
         Button(btn_frame, text="Clear", width=10, command=self.clear_fields).grid(row=0, column=2, padx=5)
+        Button(btn_frame, text="New Session", width=10, command=self.new_session).grid(row=1, column=0, padx=5, pady=10)
+        Button(btn_frame, text="Search All Sessions", command=self.search_sessions).grid(
+            row=1, column=1, columnspan=2, padx=5, pady=10)
 
         # Display Frame
         display_frame = Frame(self.root, bd=4, relief=RIDGE)
@@ -105,18 +303,108 @@ class SchoolManagement:
         self.student_table.column("name", width=100)
         self.student_table.column("age", width=50)
         self.student_table.pack(fill=BOTH, expand=1)
+
+        # Live totals from the trigger-maintained summary tables
+        self.totals_label = Label(self.root, text="", anchor="w", justify=LEFT)
+        self.totals_label.place(x=20, y=480, width=760, height=50)
         self.display_all()
+        self.root.after(TOTALS_POLL_MS, self.poll_totals)
 
-    def save_data(self):
-        add_student(self.name_var.get(), self.age_var.get(), self.grade_var.get(), self.gender_var.get())
+    def session_names(self):
+        names = [session for session, _ in list_sessions()]
+        if current_session() not in names:
+            names.append(current_session())
+        return names
+
+    def open_session(self, session):
+        try:
+            use_session(session)
+        except (ValueError, sqlite3.Error) as e:
+            messagebox.showerror("Error", f"Could not open session: {e}")
+            # Show the session that is still in use
+            self.session_var.set(self.session)
+            return False
+        self.session = session
+        self.session_var.set(session)
+        self.combo_session['values'] = self.session_names()
         self.display_all()
+        return True
+
+    def change_session(self, event=None):
+        self.open_session(self.session_var.get())
+
+    def new_session(self):
+        session = simpledialog.askstring("New Session", f"Session name (e.g. {current_session()}):",
+                                         parent=self.root)
+        if session is None:
+            return
+        session = session.strip()
+        if session in self.session_names():
+            messagebox.showwarning("Warning", f"Session {session} already exists")
+        self.open_session(session)
+
+    def search_sessions(self):
+        name = self.name_var.get().strip()
+        if name == "":
+            messagebox.showwarning("Warning", "Type a name to search for")
+            return
+        rows = search_all_sessions(name, include_archive=True)
+
+        window = Toplevel(self.root)
+        window.title(f"Students named '{name}' in all sessions")
+        window.geometry("500x300")
+        table = ttk.Treeview(window, columns=("session", "id", "name", "age", "grade", "gender"), show="headings")
+        for col in ("session", "id", "name", "age", "grade", "gender"):
+            table.heading(col, text=col.capitalize())
+            table.column(col, width=80)
+        table.pack(fill=BOTH, expand=1)
+        for row in rows:
+            table.insert('', END, values=row)
+
+    def save_data(self):
+        future = add_student(self.name_var.get(), self.age_var.get(), self.grade_var.get(), self.gender_var.get())
+        if future is not None:
+            self.when_written(future, "Could not add student",
+                              lambda: messagebox.showinfo("Success", "Student added successfully!"))
         self.clear_fields()
 
+    def when_written(self, future, error_text, on_success=None):
+        # Poll the write queue from the Tk loop, so a busy database (retries
+        # with backoff) never freezes the window
+        if not future.done():
+            self.root.after(20, self.when_written, future, error_text, on_success)
+            return
+        try:
+            future.result()
+        except sqlite3.Error as e:
+            messagebox.showerror("Error", f"{error_text}: {e}")
+        else:
+            if on_success is not None:
+                on_success()
+        self.display_all()
+
     def display_all(self):
         records = fetch_data()
         self.student_table.delete(*self.student_table.get_children())
         for row in records:
             self.student_table.insert('', END, values=row)
+        self.show_totals()
+
+    def show_totals(self):
+        grades, genders = fetch_totals()
+        total = sum(count for _, count in genders)
+        by_grade = ", ".join(f"{grade or '-'}: {count}" for grade, count in grades)
+        by_gender = ", ".join(f"{gender or '-'}: {count}" for gender, count in genders)
+        self.totals_label.config(text=f"Total students: {total}\nBy grade: {by_grade}\nBy gender: {by_gender}")
+
+    def poll_totals(self):
+        # Only the small totals tables are read here, so other clerks' adds and
+        # deletes show up without reloading the whole roster into the table
+        try:
+            self.show_totals()
+        except sqlite3.Error:
+            pass   # busy or mid-switch; the next poll catches up
+        self.root.after(TOTALS_POLL_MS, self.poll_totals)
 
     def remove_data(self):
         selected_item = self.student_table.focus()
@@ -125,8 +413,7 @@ class SchoolManagement:
             return
         content = self.student_table.item(selected_item)
         row = content['values']
-        delete_student(row[0])
-        self.display_all()
+        self.when_written(get_write_queue().delete_student(row[0]), "Could not delete student")
 
     def clear_fields(self):
         self.name_var.set("")
@@ -135,7 +422,7 @@ class SchoolManagement:
         self.gender_var.set("")
 
 if __name__ == "__main__":
-    initialize_db()
+    use_session(default_session())
     root = Tk()
     obj = SchoolManagement(root)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,149 @@
+# Group-commit write queue for school databases
+#
+# Inserts and deletes are queued and a background thread commits them in
+# batches: whatever queued up while the previous batch was committing (up to
+# batch_size) shares one transaction and one fsync. Each caller gets a Future
+# that is resolved only after the batch holding its write has committed.
+#
+# Batching only helps writes made from one process (several threads, or a
+# bulk import submitting many Futures). Separate SchoolManagement windows
+# each have their own queue with one write at a time; what stops them from
+# failing with "database is locked" is WAL mode, the busy timeout and the
+# retries with backoff below.
+#
+# max_delay is 0 by default: a batch is committed as soon as the writer is
+# free, so a lone write is not held back. Give it a few milliseconds to
+# wait for more writes and make batches bigger for steady bulk entry.
+import queue
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+class WriteQueue:
+    def __init__(self, db_path, batch_size=64, max_delay=0.0, retries=8, backoff=0.02):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.retries = retries
+        self.backoff = backoff
+        self.ops = queue.Queue()
+        self.closed = False
+        self.conn = None
+        self.thread = threading.Thread(target=self.run, name=f"WriteQueue({db_path})", daemon=True)
+        self.thread.start()
+
+    # --- Caller side ---
+    def submit(self, sql, params=()):
+        # Future resolving to (lastrowid, rowcount) once committed
+        if self.closed:
+            raise RuntimeError("Write queue is closed")
+        future = Future()
+        self.ops.put((sql, params, future))
+        return future
+
+    def insert_student(self, name, age, grade, gender):
+        return self.submit("INSERT INTO students (name, age, grade, gender) VALUES (?, ?, ?, ?)",
+                           (name, age, grade, gender))
+
+    def delete_student(self, student_id):
+        return self.submit("DELETE FROM students WHERE id=?", (student_id,))
+
+    def close(self):
+        # Commit everything still queued, then stop the writer thread
+        if not self.closed:
+            self.closed = True
+            self.ops.put(None)
+            self.thread.join()
+
+    # --- Writer thread ---
+    def connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=1.0, isolation_level=None)
+        # WAL lets readers carry on while a batch commits; FULL keeps every
+        # committed batch durable across power loss
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        return conn
+
+    def next_batch(self):
+        # Block for the first operation, then take whatever else is queued
+        # (waiting up to max_delay for more) until the batch is full
+        first = self.ops.get()
+        if first is None:
+            return None, True
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                op = self.ops.get(timeout=remaining) if remaining > 0 else self.ops.get_nowait()
+            except queue.Empty:
+                break
+            if op is None:
+                return batch, True
+            batch.append(op)
+        return batch, False
+
+    def commit_batch(self, conn, batch):
+        # One transaction per batch; a savepoint per operation so a bad row
+        # only fails its own caller
+        results = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params, _ in batch:
+                conn.execute("SAVEPOINT op")
+                try:
+                    cursor = conn.execute(sql, params)
+                    results.append((cursor.lastrowid, cursor.rowcount))
+                    conn.execute("RELEASE op")
+                except sqlite3.OperationalError:
+                    raise
+                except sqlite3.Error as e:
+                    conn.execute("ROLLBACK TO op")
+                    conn.execute("RELEASE op")
+                    results.append(e)
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        return results
+
+    def fail(self, batch, error):
+        for _, _, future in batch:
+            future.set_exception(error)
+
+    def write(self, batch):
+        # Retry the whole batch with exponential backoff while another
+        # process holds the write lock
+        for attempt in range(self.retries + 1):
+            try:
+                if self.conn is None:
+                    self.conn = self.connect()
+                results = self.commit_batch(self.conn, batch)
+                break
+            except sqlite3.OperationalError as e:
+                locked = "locked" in str(e) or "busy" in str(e)
+                if not locked or attempt == self.retries:
+                    self.fail(batch, e)
+                    return
+                time.sleep(self.backoff * (2 ** attempt) * (0.5 + random.random()))
+            except Exception as e:
+                self.fail(batch, e)
+                return
+
+        for (_, _, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def run(self):
+        done = False
+        while not done:
+            batch, done = self.next_batch()
+            if batch:
+                self.write(batch)
+        if self.conn is not None:
+            self.conn.close()